@@ -97,14 +97,17 @@ def optimize_change_sets(change_sets: typing.Iterable[typing.Set[ir.Node]]) -> t
     # Remove duplicates before carrying out expensive algorithm
     change_sets = list(remove_subsets(change_sets))
 
+    # Descendants of the changed nodes, built once per node for fast membership tests
+    descendants = {c: c.descendants_set for cs in change_sets for c in cs}
+
     # Iterate over all combinations of two change sets to build a replacement mapping
     for cs1, cs2 in itertools.combinations(change_sets, 2):
         # Iterate over all combinations of the changes in the sets
         for c1, c2 in itertools.product(cs1, cs2):
             # Set replacement if a node is a descendant of
-            if c1 in c2.descendants:
+            if c1 in descendants[c2]:
                 replaces[c1] = replaces.get(c2, c2)
-            elif c2 in c1.descendants:
+            elif c2 in descendants[c1]:
                 replaces[c2] = replaces.get(c1, c1)
 
     # Carry out replacements and yield the results
@@ -2,8 +2,6 @@ import enum
 import os
 import typing
 
-import itertools
-
 from checkmerge.ir import tree
 
 
@@ -150,7 +148,7 @@ class DiffResult(object):
 
     @property
     def node_count(self):
-        return sum(1 for n in itertools.chain(self.base.nodes, self.other.nodes))
+        return self.base.size + self.other.size
 
 
 class MergeDiffResult(DiffResult):
@@ -164,9 +162,11 @@ class MergeDiffResult(DiffResult):
 
         # If there is a two-way diff result, add additional mappings if none of the nodes is already mapped
         if two_way_result is not None:
+            mapped = set(mapping.values())
             for base_node, other_node in two_way_result.mapping.items():
-                if base_node not in mapping.keys() and other_node not in mapping.values():
+                if base_node not in mapping and other_node not in mapped:
                     mapping[base_node] = other_node
+                    mapped.add(other_node)
 
         # Super init
         super(MergeDiffResult, self).__init__(base, other, mapping)
@@ -211,7 +211,7 @@ class MergeDiffResult(DiffResult):
 
     @property
     def node_count(self):
-        return sum(1 for n in itertools.chain(self._base_result.base.nodes, self.base.nodes, self.other.nodes))
+        return self._base_result.base.size + self.base.size + self.other.size
 
 
 def combine_mappings(base_mapping: DiffMapping, other_mapping: DiffMapping) -> DiffMapping:
@@ -241,12 +241,13 @@ def calculate_changes(base: tree.Node, other: tree.Node, mapping: DiffMapping) -
     :return: Generator yielding the changes between the base tree and other tree.
     """
     for node in base.subtree():
-        if node not in mapping.keys():
+        if node not in mapping:
             yield Change(node, None, EditOperation.DELETE)
         elif node.name != mapping[node].name:
             yield Change(node, mapping[node], EditOperation.RENAME)
+    mapped = set(mapping.values())
     for node in other.subtree():
-        if node not in mapping.values():
+        if node not in mapped:
             yield Change(None, node, EditOperation.INSERT)
 
 
@@ -1,13 +1,15 @@
+import collections
+import functools
 import itertools
+import operator
 import typing
 
-import bidict
 import pylev3
 import zss
 
 from checkmerge.diff.base import DiffAlgorithm, DiffMapping, DiffResult
 from checkmerge.ir import tree
-from checkmerge.util.collections import PriorityList, exists
+from checkmerge.util.collections import BucketList
 
 
 class GumTreeDiff(DiffAlgorithm):
@@ -37,6 +39,12 @@ class GumTreeDiff(DiffAlgorithm):
         self.min_dice = min_dice
         self.max_size = max_size
 
+        # Cache of edit distances between subtrees, keyed by the hashes of the subtrees
+        self._distances: typing.Dict[typing.Tuple[int, int], float] = {}
+
+        # Cached edit distance between node names, which are drawn from a small set of types and labels
+        self._label_distance = functools.lru_cache(maxsize=None)(pylev3.Levenshtein.wfi)
+
     def __call__(self, base: tree.Node, other: tree.Node, mapping: typing.Optional[DiffMapping] = None) -> DiffResult:
         """
         Runs the GumTree algorithm to find a mapping between the nodes of both trees.
@@ -46,6 +54,12 @@ class GumTreeDiff(DiffAlgorithm):
         :param mapping: A mapping from nodes of the base tree to nodes of the other tree to start off with.
         :return: A mapping between nodes from the base tree to nodes from the other tree.
         """
+        # Isomorphic trees that are high enough to be matched map node for node, skip the matching phases
+        if self.isomorphic(base, other) and base.height >= self.min_height:
+            return DiffResult(base, other, dict(zip(base.subtree(), other.subtree())))
+
+        self._distances.clear()
+        self._label_distance.cache_clear()
         mapping = self.top_down(base, other)
         mapping = self.bottom_up(base, other, mapping)
         return DiffResult(base, other, mapping)
@@ -62,31 +76,42 @@ class GumTreeDiff(DiffAlgorithm):
         :return: A mapping between nodes from the base tree to nodes from the other tree.
         """
         # List of nodes to evaluate ordered by their height (one for each tree)
-        l1 = PriorityList(key=self.priority)
-        l2 = PriorityList(key=self.priority)
+        l1 = BucketList(key=self.priority)
+        l2 = BucketList(key=self.priority)
 
         # Candidate mappings
         a: typing.List[typing.Tuple[tree.Node, tree.Node]] = []
 
-        # Decided on mappings
-        m = bidict.bidict()
+        # Nodes on either side of the candidate mappings for fast membership tests
+        a1: typing.Set[tree.Node] = set()
+        a2: typing.Set[tree.Node] = set()
+
+        # Decided on mappings, and the same mappings from the other tree to the base tree
+        m: DiffMapping = {}
+        m_inv: DiffMapping = {}
+
+        # Number of subtrees per hash in both trees
+        base_counts = collections.Counter(n.hash for n in base.subtree())
+        other_counts = collections.Counter(n.hash for n in other.subtree())
 
         # Add existing mappings
         if mapping is not None:
             for k, v in mapping.items():
                 m[k] = v
+                m_inv[v] = k
 
         # Start with the root nodes
         l1.push(base)  # line 1
         l2.push(other)  # line 2
 
         # While there are large enough subtrees to compare, do comparison
-        while l1 and l2 and min(l1.peek().height, l2.peek().height) >= self.min_height:  # line 3
+        # The priority of the nodes is their height, so the top of each list is the largest height in that list
+        while l1 and l2 and min(l1.top, l2.top) >= self.min_height:  # line 3
             # Add the children of the larger subtree to the queue if the height is not equal
-            if l1.peek().height > l2.peek().height:  # line 4, 5
+            if l1.top > l2.top:  # line 4, 5
                 for t in l1.pop_many():  # line 6
                     l1.open(t.children)  # line 6
-            elif l1.peek().height < l2.peek().height:  # line 4, 7
+            elif l1.top < l2.top:  # line 4, 7
                 for t in l2.pop_many():  # line 8
                     l2.open(t.children)  # line 8
             else:  # line 9
@@ -94,37 +119,68 @@ class GumTreeDiff(DiffAlgorithm):
                 h1 = l1.pop_many()  # line 10
                 h2 = l2.pop_many()  # line 11
 
+                # Group the subtrees of the other tree by hash, as isomorphic subtrees have equal hashes
+                b2 = self.buckets(h2)
+
                 # Iterate over isomorphic pairs of subtrees
-                for t1, t2 in filter(lambda x: self.isomorphic(*x), itertools.product(h1, h2)):  # line 12, 13
-                    # If there are multiple candidates for a subtree, add these to the candidate set
-                    # Otherwise add the subtrees and their children to the mappings.
-                    if exists(other.subtree(), lambda tx: self.isomorphic(t1, tx) and tx != t2) or \
-                            exists(base.subtree(), lambda tx: self.isomorphic(tx, t2) and tx != t1):  # Line 14
-                        a.append((t1, t2))  # line 15
-                    else:
-                        # Because the trees are isomorphic walking them in the same order results in the correct
-                        # mapping between the nodes
-                        for n1, n2 in zip(t1.subtree(), t2.subtree()):
-                            m[n1] = n2  # line 17
+                for t1 in h1:  # line 12
+                    h = t1.hash
+                    for t2 in b2.get(h, ()):  # line 13
+                        # If there are multiple candidates for a subtree, add these to the candidate set
+                        # Otherwise add the subtrees and their children to the mappings.
+                        # As the pair itself has this hash, there are other candidates if the hash occurs more than
+                        # once.
+                        if other_counts[h] > 1 or base_counts[h] > 1:  # Line 14
+                            a.append((t1, t2))  # line 15
+                            a1.add(t1)
+                            a2.add(t2)
+                        else:
+                            # Because the trees are isomorphic walking them in the same order results in the correct
+                            # mapping between the nodes
+                            for n1, n2 in zip(t1.subtree(), t2.subtree()):
+                                m[n1] = n2  # line 17
+                                m_inv[n2] = n1
 
                 # Add the unmapped subtrees to the queue
                 for t in h1:  # line 18
-                    if t not in map(lambda x: x[0], a) and t not in m:  # line 18
+                    if t not in a1 and t not in m:  # line 18
                         l1.open(t.children)  # line 18
 
                 # Add the unmapped subtrees to the queue
                 for t in h2:  # line 18
-                    if t not in map(lambda x: x[1], a) and t not in m.inv:  # line 18
+                    if t not in a2 and t not in m_inv:  # line 18
                         l2.open(t.children)  # line 18
 
+        # Calculate the dice coefficient of the parents of the candidates once, as candidates often share their parents
+        scores = {}
+        keys = {}
+
+        # Descendants of the parents and the images of those of the base tree, as a parent is often paired with several
+        # other parents. Built when first scored and dropped when this phase ends.
+        descendants: typing.Dict[tree.Node, typing.FrozenSet[tree.Node]] = {}
+        images: typing.Dict[tree.Node, typing.Set[tree.Node]] = {}
+
+        for pair in a:
+            parents = p1, p2 = (pair[0].parent, pair[1].parent)
+            if parents not in scores:
+                d1 = self._descendants(p1, descendants)
+                if p1 not in images:
+                    images[p1] = {m[d] for d in d1 if d in m}
+                scores[parents] = self.dice_images(d1, images[p1], self._descendants(p2, descendants))
+            keys[pair] = scores[parents]
+
         # Sort the candidate mappings on their dice coefficient
-        a.sort(key=lambda x: self.dice(x[0].parent, x[1].parent, m), reverse=True)  # line 19
+        a.sort(key=keys.__getitem__, reverse=True)  # line 19
 
         # Add candidates in order to the mapping if the nodes are not mapped to ensure the best options are chosen
         for t1, t2 in a:  # line 20, 21
-            if t1 not in m and t2 not in m.inv:  # line 23, 24
-                for n1, n2 in filter(lambda x: self.isomorphic(*x) and x[0] not in m and x[1] not in m.inv, itertools.product(t1.subtree(), t2.subtree())):
-                    m[n1] = n2  # line 22
+            if t1 not in m and t2 not in m_inv:  # line 23, 24
+                b2 = self.buckets(t2.subtree())
+                for n1 in t1.subtree():
+                    for n2 in b2.get(n1.hash, ()):
+                        if n1 not in m and n2 not in m_inv:
+                            m[n1] = n2  # line 22
+                            m_inv[n2] = n1
 
         return m
 
@@ -142,13 +198,31 @@ class GumTreeDiff(DiffAlgorithm):
                   the top down phase algorithm.
         :return: A mapping between nodes from the base tree to nodes from the other tree.
         """
+        # The mappings from the other tree to the base tree
+        m_inv = {v: k for k, v in m.items()}
+
+        # Nodes of the other tree grouped by type, walked once
+        other_nodes = collections.defaultdict(list)
+        for tx in other.subtree(reverse=True):
+            other_nodes[tx.type].append(tx)
+
+        # Descendants of the nodes of the other tree, built when first scored and dropped when this phase ends
+        other_descendants: typing.Dict[tree.Node, typing.FrozenSet[tree.Node]] = {}
+
         # Iterate over unmatched nodes
-        for t1 in filter(lambda x: x not in m, base.subtree(reverse=True)):  # line 1
+        for t1 in base.subtree(reverse=True):  # line 1
             # Do steps if a child is matched
-            if [c for c in t1.children if c in m]:
-                # Select similar nodes based on dice coefficient
-                t2s = filter(lambda y: y[1] not in m.values() and y[0] > self.min_dice and t1.type == y[1].type,
-                             ((self.dice(t1, tx, m), tx) for tx in other.subtree(reverse=True)))  # line 2, 3
+            if t1 not in m and any(c in m for c in t1.children):
+                # Nodes mapped to the descendants of this node, the same for every candidate. As the mapping is
+                # one-to-one, the number of common descendants is the size of the intersection with this set.
+                d1 = t1.descendants_set
+                images = {m[d] for d in d1 if d in m}
+
+                # Select similar nodes based on dice coefficient, only for unmapped nodes of the same type
+                candidates = (tx for tx in other_nodes.get(t1.type, ()) if tx not in m_inv)
+                scored = ((self.dice_images(d1, images, self._descendants(tx, other_descendants)), tx)
+                          for tx in candidates)  # line 2, 3
+                t2s = (y for y in scored if y[0] > self.min_dice)  # line 2, 3
 
                 # Choose best match
                 t2 = max(t2s, default=(None, None))[1]  # line 2, 3
@@ -156,17 +230,20 @@ class GumTreeDiff(DiffAlgorithm):
                 # Store best match as mapping
                 if t2 is not None:  # line 3
                     m[t1] = t2  # line 4
+                    m_inv[t2] = t1
 
-                    t1l = len(list(t1.subtree(include_self=False)))  # line 5
-                    t2l = len(list(t2.subtree(include_self=False)))  # line 5
+                    t1l = t1.size - 1  # line 5
+                    t2l = t2.size - 1  # line 5
 
                     # Ensure we only do the following computation for suitably small trees
                     if max(t1l, t2l) < self.max_size:  # line 5
                         # Try to match even more nodes based on their edit distance
-                        pairs = filter(lambda x: x[0] is not None and x[1] is not None, self.opt(t1, t2))  # line 6
-                        for r1, r2 in pairs:  # line 7
-                            if r1 not in m.keys() and r2 not in m.values() and r1.type == r2.type:  # line 8
+                        for r1, r2 in self.opt(t1, t2):  # line 6, 7
+                            if r1 is None or r2 is None:
+                                continue
+                            if r1 not in m and r2 not in m_inv and r1.type == r2.type:  # line 8
                                 m[r1] = r2  # line 9
+                                m_inv[r2] = r1
 
         return m
 
@@ -182,24 +259,48 @@ class GumTreeDiff(DiffAlgorithm):
         candidates = {}
 
         for t1, t2 in itertools.product(base.subtree(), other.subtree()):
-            distance = zss.simple_distance(t1, t2, get_children=lambda n: n.children, get_label=lambda n: n.name,
-                                           label_dist=pylev3.Levenshtein.wfi)
+            distance = self.distance(t1, t2)
 
             if t1 not in candidates or candidates[t1][0] > distance:
                 candidates[t1] = (distance, t2)
 
         return [(n, t[1]) for n, t in candidates.items()]
 
+    def distance(self, t1: tree.Node, t2: tree.Node) -> float:
+        """
+        Calculates the edit distance between two subtrees using the Zhang-Shasha algorithm.
+
+        The edit distance only depends on the structure and the names of the nodes in the subtrees, so results are
+        cached by the hashes of the subtrees. Isomorphic subtrees have an edit distance of 0. The Levenshtein distance
+        between node names is cached as well.
+
+        :param t1: The first subtree.
+        :param t2: The second subtree.
+        :return: The edit distance between the subtrees.
+        """
+        if self.isomorphic(t1, t2):
+            return 0
+
+        key = (t1.hash, t2.hash)
+        distance = self._distances.get(key)
+
+        if distance is None:
+            distance = zss.simple_distance(t1, t2, get_children=operator.attrgetter('children'),
+                                           get_label=operator.attrgetter('name'), label_dist=self._label_distance)
+            self._distances[key] = distance
+
+        return distance
+
     @staticmethod
     def priority(t: tree.Node) -> int:
         """
-        Key function for the priority list. Ensures the ordering of the nodes in the list is according to their height,
+        Key function for the bucket list. Ensures the ordering of the nodes in the list is according to their height,
         with the largest height as the highest priority.
 
         :param t: The node to get the priority for.
         :return: The priority as integer.
         """
-        return 0 - t.height
+        return t.height
 
     @staticmethod
     def dice(t1: tree.Node, t2: tree.Node, mappings: DiffMapping) -> float:
@@ -213,21 +314,66 @@ class GumTreeDiff(DiffAlgorithm):
         :param mappings: The mappings between nodes of t1 (keys) and t2 (values).
         :return: The dice coefficient given the two subtrees and the mappings.
         """
-        d1 = set(t1.descendants)
-        d2 = set(t2.descendants)
-        common = len({d for d in d1 if mappings.get(d) in d2})
+        d1 = t1.descendants_set
+        d2 = t2.descendants_set
+        common = sum(1 for d in d1 if mappings.get(d) in d2)
+        return float(2 * common) / float(len(d1) + len(d2))
+
+    @staticmethod
+    def dice_images(d1: typing.AbstractSet[tree.Node], images: typing.AbstractSet[tree.Node],
+                    d2: typing.AbstractSet[tree.Node]) -> float:
+        """
+        Calculates the same coefficient as `dice()` from precomputed sets of descendants. This is more efficient when
+        one node is compared with many other nodes.
+
+        :param d1: The descendants of the first node.
+        :param images: The nodes that the descendants of the first node are mapped to.
+        :param d2: The descendants of the second node.
+        :return: The dice coefficient given the two subtrees and the mappings.
+        """
+        common = len(images & d2)
         return float(2 * common) / float(len(d1) + len(d2))
 
+    @staticmethod
+    def _descendants(t: tree.Node,
+                     cache: typing.Dict[tree.Node, typing.FrozenSet[tree.Node]]) -> typing.FrozenSet[tree.Node]:
+        """
+        Returns the descendants of a node as a set, using and filling the given cache.
+
+        :param t: The node to get the descendants for.
+        :param cache: The cache of descendant sets.
+        :return: The descendants of the node.
+        """
+        descendants = cache.get(t)
+        if descendants is None:
+            descendants = cache[t] = t.descendants_set
+        return descendants
+
     @staticmethod
     def jaccard(t1: tree.Node, t2: tree.Node, mappings: typing.Dict[tree.Node, tree.Node]) -> float:
-        d1 = set(t1.descendants)
-        d2 = set(t2.descendants)
-        common = len({d for d in d1 if mappings.get(d) in d2})
+        d1 = t1.descendants_set
+        d2 = t2.descendants_set
+        common = sum(1 for d in d1 if mappings.get(d) in d2)
         try:
             return float(common) / float(len(d1) + len(d2) - common)
         except ZeroDivisionError:
             return 1.0
 
+    @staticmethod
+    def buckets(nodes: typing.Iterable[tree.Node]) -> typing.Dict[int, typing.List[tree.Node]]:
+        """
+        Groups the given nodes by the hash of their subtree. Isomorphic subtrees end up in the same bucket, which allows
+        for finding isomorphic pairs of subtrees without comparing every pair. The order of the nodes is preserved
+        within a bucket.
+
+        :param nodes: The nodes to group.
+        :return: A dictionary mapping subtree hashes to the nodes with that hash.
+        """
+        buckets = collections.defaultdict(list)
+        for node in nodes:
+            buckets[node.hash].append(node)
+        return buckets
+
     @staticmethod
     def isomorphic(t1: tree.Node, t2: tree.Node) -> bool:
         """
@@ -44,6 +44,20 @@ class OriginalGumTreeTestCase(unittest.TestCase):
 
         self.assertEqual(4, len(mapping))
 
+    def test_tied_heights(self):
+        """Tests that isomorphic candidates of equal height are mapped in the order in which they were found."""
+        t1 = Node(typ="0", label="r", children=[Node(typ="0", label="a"), Node(typ="0", label="a")])
+        t2 = Node(typ="0", label="s", children=[Node(typ="0", label="a"), Node(typ="0", label="a"),
+                                                Node(typ="0", label="a")])
+
+        diff = GumTreeDiff(min_height=1, max_size=0)
+        mapping = diff(t1, t2).mapping
+
+        self.assertIs(t2[0], mapping[t1[0]])
+        self.assertIs(t2[1], mapping[t1[1]])
+        self.assertIs(t2, mapping[t1])
+        self.assertEqual(3, len(mapping))
+
     def test_max_size_threshold(self):
         diff = GumTreeDiff(min_height=1, max_size=0)
         mapping = diff(self.t1, self.t2).mapping
@@ -260,3 +274,18 @@ class EuclidGumTreeTestCase(unittest.TestCase):
         self.assertEqual(n, len(set(result.mapping.keys())))  # Test uniqueness of keys
         self.assertEqual(n, len(set(result.mapping.values())))   # Test uniqueness of values
         self.assertEqual(0, len(result.changes))
+
+    def test_equal_copies(self):
+        t1 = Node("Block", children=[Node("Return", children=[Node("VariableRef", "a")])])
+        t2 = Node("Block", children=[Node("Return", children=[Node("VariableRef", "a")])])
+        result = GumTreeDiff()(t1, t2)
+
+        self.assertEqual(list(zip(t1.subtree(), t2.subtree())), list(result.mapping.items()))
+        self.assertEqual(0, len(result.changes))
+
+    def test_equal_below_min_height(self):
+        t1 = Node("VariableRef", "a")
+        t2 = Node("VariableRef", "a")
+        result = GumTreeDiff()(t1, t2)
+
+        self.assertEqual({}, result.mapping)
@@ -1,5 +1,6 @@
+import operator
+import sys
 import typing
-from functools import total_ordering
 
 
 class Metadata(object):
@@ -16,12 +17,11 @@ class Metadata(object):
         raise NotImplementedError(msg)
 
 
-@total_ordering
 class Location(object):
     """
     Location in source code.
     """
-    __slots__ = ('file', 'line', 'column')
+    __slots__ = ('file', 'line', 'column', '_tuple', '_hash')
 
     def __init__(self, file: str, line: int, column: int):
         """
@@ -29,13 +29,19 @@ class Location(object):
         :param line: The line number in the file.
         :param column: The column number in the line.
         """
-        # Set properties
-        self.file: str = file
+        # Set properties, interning the file as many locations share the same one
+        self.file: str = sys.intern(file)
         self.line: int = line
         self.column: int = column
 
+        # Initialize fields
+        self._tuple: typing.Optional[typing.Tuple[str, int, int]] = None
+        self._hash: typing.Optional[int] = None
+
     def as_tuple(self) -> typing.Tuple[str, int, int]:
-        return self.file, self.line, self.column
+        if self._tuple is None:
+            self._tuple = self.file, self.line, self.column
+        return self._tuple
 
     @property
     def coordinates(self) -> typing.Tuple[int, int]:
@@ -52,17 +58,20 @@ class Location(object):
         return f"<{self.__class__.__name__} {self}>"
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, Location):
             return NotImplemented
 
-        # Test lines and columns
-        eq = self.line == other.line and self.column == other.column
+        # Test lines and columns first, as these are cheap and most likely to differ
+        if self.line != other.line or self.column != other.column:
+            return False
 
         # Test files if present
         if self.file or other.file:
-            eq = eq and self.file == other.file
+            return self.file == other.file
 
-        return eq
+        return True
 
     def __lt__(self, other):
         if not isinstance(other, Location):
@@ -78,13 +87,30 @@ class Location(object):
             return self.as_tuple() <= other.as_tuple()
         return self.coordinates <= other.coordinates
 
+    def __gt__(self, other):
+        if not isinstance(other, Location):
+            return NotImplemented
+        if self.file and other.file:
+            return self.as_tuple() > other.as_tuple()
+        return self.coordinates > other.coordinates
+
+    def __ge__(self, other):
+        if not isinstance(other, Location):
+            return NotImplemented
+        if self.file and other.file:
+            return self.as_tuple() >= other.as_tuple()
+        return self.coordinates >= other.coordinates
+
     def __hash__(self):
-        return hash(str(self))
+        if self._hash is None:
+            self._hash = hash(self.as_tuple())
+        return self._hash
 
     @classmethod
     def parse(cls: typing.Type["Location"], value: str) -> typing.Optional["Location"]:
         """
-        Parses a semicolon `:` separated location string in the format `filename:line:column`.
+        Parses a semicolon `:` separated location string in the format `filename:line:column`. The file name may
+        contain colons itself.
 
         :param value: The location string.
         :return: A new instance.
@@ -92,13 +118,13 @@ class Location(object):
         if len(value) == 0:
             return None
 
-        segments = value.split(':')
+        # Split from the right, so no list is built and colons in the file name are kept
+        rest, _, column = value.rpartition(':')
+        file, sep, line = rest.rpartition(':')
 
-        if len(segments) != 3:
+        if not sep:
             raise ValueError(f"The location string {value} is invalid.")
 
-        file, line, column = segments
-
         return cls(file, int(line), int(column))
 
 
@@ -106,7 +132,7 @@ class Range(object):
     """
     Range of locations in source code.
     """
-    __slots__ = ('start', 'end')
+    __slots__ = ('start', 'end', '_hash')
 
     def __init__(self, start: Location, end: Location):
         """
@@ -118,6 +144,9 @@ class Range(object):
         self.start = start
         self.end = end
 
+        # Initialize fields
+        self._hash: typing.Optional[int] = None
+
     def as_tuple(self) -> typing.Tuple[typing.Tuple[str, int, int], typing.Tuple[str, int, int]]:
         return self.start.as_tuple(), self.end.as_tuple()
 
@@ -134,7 +163,15 @@ class Range(object):
         :param other: The other range to test.
         :return: Whether this range overlaps with the given range.
         """
-        return other.start <= self.start < other.end or other.start < self.end <= other.end
+        # Compare plain tuples, the file is only taken into account if both ranges have one (as with locations)
+        if self.start.file and other.start.file:
+            start, end = self.start.as_tuple(), self.end.as_tuple()
+            other_start, other_end = other.start.as_tuple(), other.end.as_tuple()
+        else:
+            start, end = self.start.coordinates, self.end.coordinates
+            other_start, other_end = other.start.coordinates, other.end.coordinates
+
+        return other_start <= start < other_end or other_start < end <= other_end
 
     def contains(self, other: typing.Union[Location, "Range"]):
         """
@@ -168,7 +205,9 @@ class Range(object):
         return super(Range, self).__contains__(item)
 
     def __hash__(self):
-        return hash(str(self))
+        if self._hash is None:
+            self._hash = hash((self.start, self.end))
+        return self._hash
 
     @classmethod
     def compress(cls, *ranges: "Range") -> typing.List["Range"]:
@@ -177,16 +216,16 @@ class Range(object):
         bound.
 
         :param ranges: The ranges to compress.
-        :return: A set containing the compressed ranges.
+        :return: A list containing the compressed ranges.
         """
-        sorted_ranges = sorted(ranges, key=lambda r: r.start)
-        result = [next(sorted_ranges)] if len(ranges) > 0 else []
-
-        for higher in ranges:
-            lower = result[-1]
-
-            if higher.overlaps(lower) and lower.end < higher.end:
-                result[-1] = cls(lower.start, higher.end)
+        result = []
+
+        # Sweep over the ranges by lower bound, so a range can only overlap with the last merged range
+        for higher in sorted(ranges, key=operator.attrgetter('start')):
+            if result and higher.start < result[-1].end:
+                lower = result[-1]
+                if lower.end < higher.end:
+                    result[-1] = cls(lower.start, higher.end)
             else:
                 result.append(higher)
 
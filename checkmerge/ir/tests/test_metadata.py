@@ -1,7 +1,7 @@
 import random
 import unittest
 
-from checkmerge.ir.metadata import Location
+from checkmerge.ir.metadata import Location, Range
 
 
 class LocationTestCase(unittest.TestCase):
@@ -25,6 +25,25 @@ class LocationTestCase(unittest.TestCase):
         self.assertEqual(self.file, location.file)
         self.assertEqual(self.line, location.line)
         self.assertEqual(self.column, location.column)
+        self.assertIs(Location.parse(self.string).file, location.file)
+
+    def test_parse_invalid(self):
+        """
+        Tests parsing invalid and empty location strings.
+        """
+        self.assertIsNone(Location.parse(''))
+        self.assertRaises(ValueError, Location.parse, f"{self.file}:{self.line}")
+        self.assertRaises(ValueError, Location.parse, f"{self.file}:{self.line}:x")
+
+    def test_parse_file_with_separator(self):
+        """
+        Tests parsing a location string with a file name that contains the separator.
+        """
+        location = Location.parse(f"C:{self.file}:{self.line}:{self.column}")
+
+        self.assertEqual(f"C:{self.file}", location.file)
+        self.assertEqual(self.line, location.line)
+        self.assertEqual(self.column, location.column)
 
     def test_equality(self):
         """
@@ -46,6 +65,10 @@ class LocationTestCase(unittest.TestCase):
         self.assertFalse(base_location == different_line_location)
         self.assertFalse(base_location == different_column_location)
 
+        # Test hashes of equal objects
+        self.assertEqual(hash(base_location), hash(equal_location))
+        self.assertEqual(1, len({base_location, equal_location}))
+
     def test_is_line(self):
         """
         Tests full line detection.
@@ -89,9 +112,68 @@ class LocationTestCase(unittest.TestCase):
             self.assertLess(location, other)
             self.assertLessEqual(location, other)
 
+    def test_comparable_without_file(self):
+        """
+        Tests that a location without a file is only compared on its coordinates.
+        """
+        location = Location(self.file + 'pp', self.line, self.column)
+        no_file_location = Location('', self.line, self.column)
+
+        self.assertFalse(location < no_file_location)
+        self.assertFalse(location > no_file_location)
+        self.assertTrue(location <= no_file_location)
+        self.assertTrue(location >= no_file_location)
+
 
 class NoFileLocationTestCase(LocationTestCase):
     """
     Tests for the Location class with an undefined file.
     """
     file = ''
+
+
+class RangeTestCase(unittest.TestCase):
+    """
+    Tests for the Range class.
+    """
+    file = '/home/user/code/file.c'
+
+    def range(self, start_line: int, end_line: int) -> Range:
+        return Range(Location(self.file, start_line, 1), Location(self.file, end_line, 1))
+
+    def test_hash(self):
+        """
+        Tests that equal ranges have equal hashes.
+        """
+        self.assertEqual(hash(self.range(1, 5)), hash(self.range(1, 5)))
+        self.assertEqual(1, len({self.range(1, 5), self.range(1, 5)}))
+        self.assertEqual(2, len({self.range(1, 5), self.range(1, 6)}))
+
+    def test_overlaps(self):
+        """
+        Tests detecting (partially) overlapping ranges.
+        """
+        self.assertTrue(self.range(1, 5).overlaps(self.range(3, 8)))
+        self.assertTrue(self.range(3, 8).overlaps(self.range(1, 5)))
+        self.assertTrue(self.range(3, 4).overlaps(self.range(1, 5)))
+        self.assertFalse(self.range(1, 5).overlaps(self.range(5, 8)))
+        self.assertFalse(self.range(1, 5).overlaps(self.range(6, 8)))
+
+        other_file = Range(Location(self.file + 'pp', 3, 1), Location(self.file + 'pp', 8, 1))
+        no_file = Range(Location('', 3, 1), Location('', 8, 1))
+        self.assertFalse(self.range(1, 5).overlaps(other_file))
+        self.assertTrue(self.range(1, 5).overlaps(no_file))
+
+    def test_compress(self):
+        """
+        Tests merging overlapping ranges given in arbitrary order.
+        """
+        ranges = [self.range(20, 25), self.range(1, 5), self.range(3, 8), self.range(21, 22), self.range(10, 12)]
+
+        self.assertEqual([self.range(1, 8), self.range(10, 12), self.range(20, 25)], Range.compress(*ranges))
+
+    def test_compress_empty(self):
+        """
+        Tests compressing no ranges at all.
+        """
+        self.assertEqual([], Range.compress())
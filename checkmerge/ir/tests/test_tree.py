@@ -1,8 +1,22 @@
+import sys
 import unittest
 
 from checkmerge.ir.tree import Node, Dependency, DependencyType
 
 
+def _deep_chain(depth):
+    """
+    Builds a tree in which every node has exactly one child, except for the leaf.
+
+    :param depth: The number of nodes below the root.
+    :return: The root and the leaf of the tree.
+    """
+    root = node = Node("child")
+    for _ in range(depth):
+        node = Node("child", parent=node)
+    return root, node
+
+
 class IRNodeTestCase(unittest.TestCase):
     def setUp(self):
         self.root = Node("root", label="2")
@@ -22,6 +36,13 @@ class IRNodeTestCase(unittest.TestCase):
         self.assertEqual([self.l, self.ll, self.lr, self.lrl, self.lrr, self.r, self.rr, self.rrl],
                          list(self.root.descendants))
 
+    def test_descendants_set(self):
+        """Tests the set of descendants of a node."""
+        self.assertEqual(frozenset(), self.rrl.descendants_set)
+        self.assertEqual({self.rr, self.rrl}, self.r.descendants_set)
+        self.assertEqual(set(self.root.descendants), self.root.descendants_set)
+        self.assertNotIn(self.root, self.root.descendants_set)
+
     def test_nodes(self):
         """Tests the generation of the node list of a node."""
         self.assertEqual([self.lrl], list(self.lrl.nodes))
@@ -34,11 +55,43 @@ class IRNodeTestCase(unittest.TestCase):
         self.assertEqual(3, self.l.height)
         self.assertEqual(4, self.root.height)
 
+    def test_height_deep(self):
+        """Tests the calculation of the height of a tree deeper than the recursion limit."""
+        root, node = _deep_chain(sys.getrecursionlimit())
+
+        self.assertEqual(1, node.height)
+        self.assertEqual(sys.getrecursionlimit() + 1, root.height)
+        self.assertEqual(sys.getrecursionlimit(), root.children[0].height)
+
+    def test_size(self):
+        """Tests the calculation of the size of a node."""
+        self.assertEqual(1, self.ll.size)
+        self.assertEqual(5, self.l.size)
+        self.assertEqual(len(list(self.root.subtree())), self.root.size)
+
+    def test_size_deep(self):
+        """Tests the calculation of the size of a tree deeper than the recursion limit."""
+        root, node = _deep_chain(sys.getrecursionlimit())
+
+        self.assertEqual(1, node.size)
+        self.assertEqual(sys.getrecursionlimit() + 1, root.size)
+        self.assertEqual(sys.getrecursionlimit(), root.children[0].size)
+
     def test_hash(self):
         """Tests the calculation of a hash of a node."""
         self.assertEqual(self.root.hash, self.root.hash)
         self.assertNotEqual(self.l.hash, self.r.hash)
         self.assertEqual(self.rrl.hash, Node("child", label="4").hash)
+        self.assertNotEqual(Node("child").hash, Node("child", label="None").hash)
+        self.assertIsInstance(self.root.hash, int)
+
+    def test_hash_deep(self):
+        """Tests that the hash of a tree deeper than the recursion limit can be calculated."""
+        roots = [_deep_chain(sys.getrecursionlimit())[0] for _ in range(2)]
+
+        self.assertEqual(roots[0].hash, roots[1].hash)
+        self.assertEqual(roots[0].children[0].hash, roots[1].children[0].hash)
+        self.assertNotEqual(roots[0].hash, roots[0].children[0].hash)
 
     def test_subtree(self):
         """Tests the top down walking of subtrees."""
@@ -48,6 +101,42 @@ class IRNodeTestCase(unittest.TestCase):
                          list(self.root.subtree()))
         self.assertEqual([self.ll, self.lrl, self.lrr, self.lr, self.l, self.rrl, self.rr, self.r, self.root],
                          list(self.root.subtree(reverse=True)))
+        self.assertEqual([self.lrl, self.lrr], list(self.lr.subtree(include_self=False)))
+        self.assertEqual([self.lrl, self.lrr], list(self.lr.subtree(include_self=False, reverse=True)))
+
+    def test_add_child(self):
+        """Tests that the cached values of the ancestors are updated when a node is added to the tree."""
+        self.assertEqual(9, self.root.size)
+        self.assertEqual(4, self.root.height)
+        root_hash, r_hash, l_hash = self.root.hash, self.r.hash, self.l.hash
+
+        node = Node("child", parent=self.rrl)
+
+        self.assertEqual(10, len(list(self.root.subtree())))
+        self.assertIs(node, self.root.descendants[-1])
+        self.assertIn(node, self.r.descendants_set)
+        self.assertEqual(10, self.root.size)
+        self.assertEqual(5, self.root.height)
+        self.assertNotEqual(root_hash, self.root.hash)
+        self.assertNotEqual(r_hash, self.r.hash)
+        self.assertEqual(l_hash, self.l.hash)
+
+    def test_recursive_dependencies_cycle(self):
+        """Tests that cyclic dependencies are followed once and every node is yielded once."""
+        self.ll.add_dependencies(Dependency(self.lr, DependencyType.FLOW))
+        self.lr.add_dependencies(Dependency(self.r, DependencyType.FLOW))
+        self.r.add_dependencies(Dependency(self.ll, DependencyType.FLOW))
+
+        self.assertEqual([self.lr, self.r], list(self.ll.recursive_dependencies()))
+        self.assertEqual([self.r, self.lr], list(self.ll.recursive_reverse_dependencies()))
+
+    def test_subtree_deep(self):
+        """Tests walking a subtree deeper than the recursion limit."""
+        root, node = _deep_chain(sys.getrecursionlimit())
+
+        self.assertEqual(len(list(root.subtree())), len(list(root.subtree(reverse=True))))
+        self.assertIs(node, next(root.subtree(reverse=True)))
+        self.assertIs(node, root.descendants[-1])
 
     def test_dependencies(self):
         """Tests adding and querying dependencies."""
@@ -1,5 +1,8 @@
 import enum
 import hashlib
+import itertools
+import operator
+import sys
 import typing
 import weakref
 from functools import total_ordering
@@ -85,9 +88,8 @@ class Dependency(object):
 
     @property
     def node(self) -> typing.Optional["Node"]:
-        if callable(self._node):
-            return self._node()
-        return self._node
+        node = self._node
+        return node() if node is not None else None
 
     @node.setter
     def node(self, value: "Node") -> None:
@@ -128,8 +130,8 @@ class Node(object):
     collection. It is therefore important to keep a reference to the root of the tree.
     """
     __slots__ = ('type', 'label', 'ref', '_parent', 'children', 'source_range', 'metadata', '_is_memory_operation',
-                 '_dependencies', '_reverse_dependencies', '_mapping', '_changed', '_height', '_hash', '_hash_str',
-                 '_root', '__weakref__')
+                 '_dependencies', '_reverse_dependencies', '_mapping', '_changed', '_height', '_size', '_hash', '_root',
+                 '__weakref__')
 
     def __init__(self, typ: str, label: typing.Optional[str] = None, ref: typing.Optional[str] = None,
                  parent: typing.Optional["Node"] = None,
@@ -147,9 +149,9 @@ class Node(object):
         :param metadata: The metadata of this node.
         :param is_memory_operation: Overrides the automatic detection of memory operations for analysis purposes.
         """
-        # Initialize and set fields from arguments
-        self.type: str = typ
-        self.label: typing.Optional[str] = label
+        # Initialize and set fields from arguments, interning the type and label as these repeat throughout a tree
+        self.type: str = sys.intern(typ)
+        self.label: typing.Optional[str] = sys.intern(label) if label is not None else None
         self.ref: typing.Optional[str] = ref
         self._parent = None
         self.parent = parent
@@ -164,9 +166,10 @@ class Node(object):
                 raise ValueError("A child cannot be added if a parent is already set.")
             child.parent = self
 
-        # Check parent and add as child
+        # Check parent and add as child, which changes the subtrees of all ancestors
         if self.parent is not None and self not in self.parent.children:
             self.parent.children.append(self)
+            self.parent._clear_subtree_cache()
 
         # Initialize fields
         self._dependencies: typing.Set[Dependency] = set()
@@ -174,16 +177,15 @@ class Node(object):
         self._mapping: typing.Optional[Node] = None
         self._changed: typing.Optional[bool] = None
         self._height = None
+        self._size = None
         self._hash = None
-        self._hash_str = None
         self._root = None
 
     @property
     def parent(self) -> typing.Optional["Node"]:
         """Getter for the parent node that unwraps the weak reference."""
-        if callable(self._parent):
-            return self._parent()
-        return self._parent
+        parent = self._parent
+        return parent() if parent is not None else None
 
     @parent.setter
     def parent(self, value: typing.Optional["Node"]):
@@ -193,11 +195,19 @@ class Node(object):
         else:
             self._parent = weakref.ref(value)
 
+    def _clear_subtree_cache(self) -> None:
+        """Clears the cached values that depend on the subtree of this node for this node and all of its ancestors."""
+        node = self
+        while node is not None:
+            node._height = node._size = node._hash = None
+            node = node.parent
+
     @property
     def root(self) -> "Node":
         """The root node of the tree."""
         if self._root is None:
-            self._root = self.parent.root if self.parent is not None else self
+            parent = self.parent
+            self._root = parent.root if parent is not None else self
         return self._root
 
     @property
@@ -219,11 +229,8 @@ class Node(object):
         :return: Whether this node represents a memory operation.
         """
         if self._is_memory_operation is None:
-            for dependency in set().union(self.dependencies, self.reverse_dependencies):
-                if dependency.type.is_memory_dependency():
-                    self._is_memory_operation = True
-                    break
-            self._is_memory_operation = True if self._is_memory_operation else False
+            dependencies = itertools.chain(self._dependencies, self._reverse_dependencies)
+            self._is_memory_operation = any(d.type.is_memory_dependency() for d in dependencies)
         return self._is_memory_operation
 
     @property
@@ -255,8 +262,9 @@ class Node(object):
 
         :param dependencies: The dependencies to add.
         """
+        self._dependencies.update(dependencies)
+
         for dependency in dependencies:
-            self._dependencies.add(dependency)
             dependency.node._reverse_dependencies.add(Dependency(self, dependency.type, reverse=True))
 
     @property
@@ -304,46 +312,100 @@ class Node(object):
         return len(self.children) == 0
 
     @property
-    def descendants(self) -> typing.Generator["Node", None, None]:
-        """Generator for the descendants of this node. Yields the descendants top-down in a depth-first manner."""
-        for child in self.children:
-            yield child
-            yield from child.descendants
+    def descendants(self) -> typing.Tuple["Node", ...]:
+        """
+        The descendants of this node, ordered top-down in a depth-first manner. The tuple is built on every access, so
+        callers using it repeatedly should keep a reference to it.
+        """
+        return tuple(self._walk_descendants())
+
+    def _walk_descendants(self) -> typing.Generator["Node", None, None]:
+        """Generator for the descendants of this node, ordered top-down in a depth-first manner."""
+        # Walk iteratively, the children are pushed in reverse to be visited from left to right
+        stack = self.children[::-1]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    @property
+    def descendants_set(self) -> typing.FrozenSet["Node"]:
+        """
+        The descendants of this node as a set. Allows for fast membership tests. The set is built on every access, so
+        callers testing the same node repeatedly should keep a reference to it.
+        """
+        return frozenset(self._walk_descendants())
 
     @property
     def nodes(self) -> typing.Generator["Node", None, None]:
         """Generator for the nodes in this subtree. Yields the nodes top-down in a depth-first manner."""
         yield self
-        yield from self.descendants
+        yield from self._walk_descendants()
 
     @property
     def height(self) -> int:
         """The height of the subtree."""
         if self._height is None:
-            self._height = self._get_height()
+            for node in self._uncached_bottom_up('_height'):
+                node._height = node._get_height()
         return self._height
 
     def _get_height(self) -> int:
-        """Calculates the height of the subtree recursively."""
+        """Calculates the height of this node from the heights of its children, which must be known already."""
         if len(self.children) > 0:
-            return max(map(lambda n: n.height, self.children)) + 1
+            return max(map(operator.attrgetter('_height'), self.children)) + 1
         return 1
 
     @property
-    def hash(self) -> str:
-        """A hash of this subtree. Allows for finding equal subtrees. This hash does NOT uniquely identify this node."""
+    def size(self) -> int:
+        """The number of nodes in the subtree, including this node."""
+        if self._size is None:
+            for node in self._uncached_bottom_up('_size'):
+                node._size = node._get_size()
+        return self._size
+
+    def _get_size(self) -> int:
+        """Calculates the size of this node from the sizes of its children, which must be known already."""
+        return sum(map(operator.attrgetter('_size'), self.children)) + 1
+
+    @property
+    def hash(self) -> int:
+        """
+        A hash of this subtree. Allows for finding equal subtrees. This hash does NOT uniquely identify this node.
+
+        The hash is a 64-bit Merkle digest of the type and label of this node and the hashes of its children, so equal
+        subtrees can be compared and looked up as plain integers.
+        """
         if self._hash is None:
-            hasher = hashlib.blake2b()
-            hasher.update(self._get_hash_str().encode())
-            self._hash = hasher.hexdigest()
+            for node in self._uncached_bottom_up('_hash'):
+                node._hash = node._get_hash()
         return self._hash
 
-    def _get_hash_str(self) -> str:
-        """Calculates the string used for calculating the hash recursively."""
-        if self._hash_str is None:
-            children = ''.join(map(Node._get_hash_str, self.children))
-            self._hash_str = f"{{{self.type}@{self.label}|{children}}}"
-        return self._hash_str
+    def _get_hash(self) -> int:
+        """Calculates the hash of this node from the hashes of its children, which must be known already."""
+        hasher = hashlib.blake2b(repr((self.type, self.label)).encode(), digest_size=8)
+        for child in self.children:
+            hasher.update(child._hash.to_bytes(8, 'little'))
+        return int.from_bytes(hasher.digest(), 'little')
+
+    def _uncached_bottom_up(self, cache: str) -> typing.Generator["Node", None, None]:
+        """
+        Generator for the nodes in this subtree that have no value in the given cache slot. Yields the nodes bottom-up,
+        so the values of the children can be cached before their parent is yielded. Subtrees with a cached value at
+        their root are skipped entirely.
+
+        :param cache: The name of the cache slot.
+        :return: A generator yielding the nodes without a cached value.
+        """
+        # Walk iteratively, a node is yielded when it is popped for the second time, after all of its children
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                yield node
+            elif getattr(node, cache) is None:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children)
 
     def subtree(self, include_self: bool = True, reverse: bool = False) -> typing.Generator["Node", None, None]:
         """
@@ -361,76 +423,85 @@ class Node(object):
         if include_self:
             yield self
 
-        for child in self.children:
-            for node in child._top_down_subtree():
-                yield node
+        yield from self._walk_descendants()
 
     def _bottom_up_subtree(self, include_self: bool = True):
         """Generator for traversing the subtree bottom-up."""
-        for child in self.children:
-            for node in child._bottom_up_subtree():
+        # Walk iteratively, a node is yielded when it is popped for the second time, after all of its children
+        stack = [(self, False)] if include_self else [(child, False) for child in reversed(self.children)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
                 yield node
+            else:
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(node.children))
 
-        if include_self:
-            yield self
-
-    def recursive_dependencies(self, exclude: typing.Optional[typing.List["Node"]] = None,
+    def recursive_dependencies(self, exclude: typing.Optional[typing.Set["Node"]] = None,
                                limit: typing.Optional[typing.Callable[[Dependency], bool]] = None,
                                recurse_memory_ops: bool = False) -> typing.Generator["Node", None, None]:
         """
         Generator for the recursive dependencies of this node. The recursive dependencies form the dependency graph
         from this node.
 
-        :param exclude: The nodes to not traverse. Used for recursive calls to prevent following cycles.
+        :param exclude: The nodes to not traverse. Used for recursive calls to prevent following cycles and yielding
+                        nodes more than once.
         :param limit: Callable accepting a dependency and returning a boolean for filtering which dependencies should be
                       traversed.
         :param recurse_memory_ops: Whether to include all child nodes of a memory operation.
         :return: A generator yielding the nodes in the dependency graph from this node.
         """
         if exclude is None:
-            exclude = [self]
+            exclude = {self}
 
         dependencies = self.dependencies if limit is None else filter(limit, self.dependencies)
 
         for dependency in dependencies:
-            exclude.append(dependency.node)
-            yield dependency.node
-            yield from dependency.node.recursive_dependencies(exclude, limit, recurse_memory_ops)
+            node = dependency.node
+            if node not in exclude:
+                exclude.add(node)
+                yield node
+                yield from node.recursive_dependencies(exclude, limit, recurse_memory_ops)
 
         if recurse_memory_ops and self.is_memory_operation:
             for child in self.subtree(include_self=False):
-                exclude.append(child)
-                yield child
-                yield from child.recursive_dependencies(exclude, limit, recurse_memory_ops)
+                if child not in exclude:
+                    exclude.add(child)
+                    yield child
+                    yield from child.recursive_dependencies(exclude, limit, recurse_memory_ops)
 
-    def recursive_reverse_dependencies(self, exclude: typing.Optional[typing.List["Node"]] = None,
+    def recursive_reverse_dependencies(self, exclude: typing.Optional[typing.Set["Node"]] = None,
                                        limit: typing.Optional[typing.Callable[[Dependency], bool]] = None,
                                        recurse_memory_ops: bool = False) -> typing.Generator["Node", None, None]:
         """
         Generator for the recursive reverse dependencies of this node. The recursive reverse dependencies form the
         dependency graph to this node.
 
-        :param exclude: The nodes to not traverse. Used for recursive calls to prevent following cycles.
+        :param exclude: The nodes to not traverse. Used for recursive calls to prevent following cycles and yielding
+                        nodes more than once.
         :param limit: Callable accepting a dependency and returning a boolean for filtering which dependencies should be
                       traversed.
         :param recurse_memory_ops: Whether to include all child nodes of a memory operation.
         :return: A generator yielding the nodes in the dependency graph to this node.
         """
         if exclude is None:
-            exclude = [self]
+            exclude = {self}
 
         dependencies = self.reverse_dependencies if limit is None else filter(limit, self.reverse_dependencies)
 
         for dependency in dependencies:
-            exclude.append(dependency.node)
-            yield dependency.node
-            yield from dependency.node.recursive_reverse_dependencies(exclude, limit, recurse_memory_ops)
+            node = dependency.node
+            if node not in exclude:
+                exclude.add(node)
+                yield node
+                yield from node.recursive_reverse_dependencies(exclude, limit, recurse_memory_ops)
 
         if recurse_memory_ops and self.is_memory_operation:
             for child in self.subtree(include_self=False):
-                exclude.append(child)
-                yield child
-                yield from child.recursive_reverse_dependencies(exclude, limit, recurse_memory_ops)
+                if child not in exclude:
+                    exclude.add(child)
+                    yield child
+                    yield from child.recursive_reverse_dependencies(exclude, limit, recurse_memory_ops)
 
     def __str__(self):
         return self.name
@@ -1,4 +1,6 @@
+import collections
 import heapq
+import itertools
 import typing
 
 
@@ -9,15 +11,20 @@ T = typing.TypeVar('T')
 class PriorityList(object):
     """
     Queue-like data structure that prioritizes smaller items. At any point, `pop()` is guaranteed to return the smallest
-    object, or when multiple objects are equally small, one of these objects.
+    object, or when multiple objects are equally small, the one of these objects that was added first.
+
+    Objects are stored together with their priority and a sequence number, so objects are never compared with each
+    other.
     """
 
     def __init__(self, key: typing.Optional[typing.Callable[[T], int]] = None):
         """
-        :param key: Optional callable that calculates the ordering key for an object.
+        :param key: Optional callable that calculates the ordering key for an object. Pass `operator.neg` to prioritize
+                    larger numbers instead.
         """
         self.key = key
-        self.data: typing.List[typing.Tuple[int, T]] = []
+        self.data: typing.List[typing.Tuple[int, int, T]] = []
+        self._counter = itertools.count()
 
     def push(self, obj: T) -> None:
         """
@@ -25,8 +32,8 @@ class PriorityList(object):
 
         :param obj: The object to add.
         """
-        item = (self.key(obj), obj) if self.key else obj
-        heapq.heappush(self.data, item)
+        priority = self.key(obj) if self.key else obj
+        heapq.heappush(self.data, (priority, next(self._counter), obj))
 
     def pop(self) -> T:
         """
@@ -35,8 +42,7 @@ class PriorityList(object):
 
         :return: The smallest item in the collection.
         """
-        data = heapq.heappop(self.data)
-        return data[1] if self.key else data
+        return heapq.heappop(self.data)[2]
 
     def pop_many(self) -> typing.List[T]:
         """
@@ -46,13 +52,14 @@ class PriorityList(object):
         :return: A list of the smallest items in the collection.
         """
         # Ensures that an IndexError is raised on an empty list
-        items = [heapq.heappop(self.data)]
+        priority, _, obj = heapq.heappop(self.data)
+        items = [obj]
 
         # As long as we have items that are at least as small (min heap), keep popping
-        while len(self.data) and self.data[0] <= items[0]:
-            items.append(heapq.heappop(self.data))
+        while self.data and self.data[0][0] <= priority:
+            items.append(heapq.heappop(self.data)[2])
 
-        return list(map(lambda x: x[1], items)) if self.key else items
+        return items
 
     def peek(self) -> T:
         """
@@ -60,8 +67,7 @@ class PriorityList(object):
 
         :return: The smallest item in the collection.
         """
-        data = self.data[0]
-        return data[1] if self.key else data
+        return self.data[0][2]
 
     def open(self, iterable: typing.Iterable[T]) -> None:
         """
@@ -69,8 +75,15 @@ class PriorityList(object):
 
         :param iterable: The items to add.
         """
-        for obj in iterable:
-            self.push(obj)
+        # Resolve the priority function once for the whole batch instead of for every item
+        counter = self._counter
+        if self.key is None:
+            entries = ((obj, next(counter), obj) for obj in iterable)
+        else:
+            entries = ((self.key(obj), next(counter), obj) for obj in iterable)
+
+        for entry in entries:
+            heapq.heappush(self.data, entry)
 
     def __bool__(self):
         return bool(self.data)
@@ -79,6 +92,108 @@ class PriorityList(object):
         return len(self.data)
 
 
+class BucketList(object):
+    """
+    Queue-like data structure for objects with small non-negative integer priorities that prioritizes larger items. At
+    any point, `pop()` is guaranteed to return the largest object, or when multiple objects are equally large, the one
+    of these objects that was added first.
+
+    Objects are stored in a list of buckets indexed by their priority, which makes adding and removing objects constant
+    time operations. The number of buckets grows with the largest priority, so this structure is only suitable for
+    small priorities such as the height of a tree.
+    """
+
+    def __init__(self, key: typing.Optional[typing.Callable[[T], int]] = None):
+        """
+        :param key: Optional callable that calculates the (non-negative) priority of an object.
+        """
+        self.key = key
+        self.buckets: typing.List[typing.Deque[T]] = []
+
+        # The largest priority in the collection, or -1 if the collection is empty
+        self.top = -1
+        self._size = 0
+
+    def push(self, obj: T) -> None:
+        """
+        Adds the given object to the collection.
+
+        :param obj: The object to add.
+        """
+        priority = self.key(obj) if self.key else obj
+
+        if priority < 0:
+            raise ValueError("The priority of an object cannot be negative.")
+
+        # Add buckets up to the priority of this object
+        while len(self.buckets) <= priority:
+            self.buckets.append(collections.deque())
+
+        self.buckets[priority].append(obj)
+        self._size += 1
+
+        if priority > self.top:
+            self.top = priority
+
+    def pop(self) -> T:
+        """
+        Removes and returns the largest object in the collection. If during construction of the list a key function was
+        given, this key is used to determine the order of the object.
+
+        :return: The largest item in the collection.
+        """
+        obj = self.buckets[self.top].popleft()
+        self._size -= 1
+        self._lower()
+        return obj
+
+    def pop_many(self) -> typing.List[T]:
+        """
+        Removes and returns all the largest objects in the collection. If during construction of the list a key function
+        was given, this key is used to determine the order of the object.
+
+        :return: A list of the largest items in the collection.
+        """
+        items = list(self.buckets[self.top])
+
+        # Ensures that an IndexError is raised on an empty list
+        if not items:
+            raise IndexError("pop from empty list")
+
+        self.buckets[self.top].clear()
+        self._size -= len(items)
+        self._lower()
+        return items
+
+    def peek(self) -> T:
+        """
+        Returns the largest object in the collection without removing it.
+
+        :return: The largest item in the collection.
+        """
+        return self.buckets[self.top][0]
+
+    def open(self, iterable: typing.Iterable[T]) -> None:
+        """
+        Adds all items from the given iterable to the collection.
+
+        :param iterable: The items to add.
+        """
+        for obj in iterable:
+            self.push(obj)
+
+    def _lower(self) -> None:
+        """Moves the top of the collection down to the largest non-empty bucket."""
+        while self.top >= 0 and not self.buckets[self.top]:
+            self.top -= 1
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __len__(self):
+        return self._size
+
+
 def remove_subsets(sets: typing.Iterable[typing.Set[T]]) -> typing.Iterable[typing.Set[T]]:
     """
     Removes sets that are identical to or a subset of another set in the provided iterable.
@@ -107,4 +222,4 @@ def exists(iterable: typing.Iterable[T], pred: typing.Optional[typing.Callable[[
     :param pred: The predicate to check the objects against.
     :return: Whether an object satisfying the predicate exists in the iterable.
     """
-    return False if next(filter(pred, iterable), False) is False else True
+    return any(iterable) if pred is None else any(map(pred, iterable))
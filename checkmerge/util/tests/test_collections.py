@@ -1,6 +1,7 @@
+import operator
 import unittest
 
-from checkmerge.util.collections import PriorityList
+from checkmerge.util.collections import BucketList, PriorityList, exists
 
 
 class PriorityListTestCase(unittest.TestCase):
@@ -34,7 +35,7 @@ class PriorityListTestCase(unittest.TestCase):
     def test_with_key_func(self):
         """Tests a priority list with a custom key function."""
         # Key function for reverse order
-        pl = PriorityList(key=lambda x: 0 - x)
+        pl = PriorityList(key=operator.neg)
 
         # Add data
         for d in self.data:
@@ -52,3 +53,101 @@ class PriorityListTestCase(unittest.TestCase):
         self.assertEqual(-1, pl.pop())
         self.assertFalse(pl)
         self.assertEqual(0, len(pl))
+
+    def test_open(self):
+        """Tests adding many items at once with and without a custom key function."""
+        pl = PriorityList()
+        pl.open(self.data)
+        self.assertEqual(sorted(self.data), [pl.pop() for _ in self.data])
+
+        pl = PriorityList(key=operator.neg)
+        pl.open(self.data)
+        self.assertEqual(sorted(self.data, reverse=True), [pl.pop() for _ in self.data])
+
+    def test_equal_priority(self):
+        """Tests that objects with an equal priority are returned in insertion order without being compared."""
+        objects = [object() for _ in range(4)]
+        pl = PriorityList(key=lambda x: 0)
+
+        # Add data
+        pl.open(objects)
+
+        # Tests
+        self.assertIs(objects[0], pl.peek())
+        self.assertIs(objects[0], pl.pop())
+        self.assertEqual(objects[1:], pl.pop_many())
+        self.assertFalse(pl)
+
+
+class BucketListTestCase(unittest.TestCase):
+    """
+    Test case for the BucketList data structure.
+    """
+    def setUp(self):
+        self.data = [10, 8, 9, 3, 0, 8, 3, 4]
+
+    def test_without_key_func(self):
+        """Tests a bucket list without using a custom key function."""
+        bl = BucketList()
+
+        # Add data
+        bl.open(self.data)
+
+        # Tests
+        self.assertEqual(len(self.data), len(bl))
+        self.assertEqual(10, bl.top)
+        self.assertEqual(10, bl.peek())
+        self.assertEqual(10, bl.pop())
+        self.assertEqual(9, bl.pop())
+        self.assertEqual([8, 8], bl.pop_many())
+        self.assertEqual([4], bl.pop_many())
+        self.assertEqual(3, bl.pop())
+        self.assertEqual(3, bl.pop())
+        self.assertTrue(bl)
+        self.assertEqual(0, bl.pop())
+        self.assertFalse(bl)
+        self.assertEqual(0, len(bl))
+        self.assertEqual(-1, bl.top)
+        self.assertRaises(IndexError, bl.pop_many)
+
+    def test_with_key_func(self):
+        """Tests a bucket list with a custom key function."""
+        # Key function for reverse order
+        bl = BucketList(key=lambda x: 10 - x)
+
+        # Add data
+        bl.open(self.data)
+
+        # Tests
+        self.assertEqual(len(self.data), len(bl))
+        self.assertEqual(0, bl.pop())
+        self.assertEqual([3, 3], bl.pop_many())
+        self.assertEqual(4, bl.pop())
+        self.assertEqual([8, 8], bl.pop_many())
+        self.assertEqual(9, bl.pop())
+        self.assertTrue(bl)
+        self.assertEqual(10, bl.pop())
+        self.assertFalse(bl)
+        self.assertEqual(0, len(bl))
+
+    def test_negative_priority(self):
+        """Tests that negative priorities are rejected."""
+        bl = BucketList()
+        self.assertRaises(ValueError, bl.push, -1)
+
+
+class ExistsTestCase(unittest.TestCase):
+    """
+    Test case for the exists function.
+    """
+    def test_without_pred(self):
+        """Tests checking the truth value of the objects themselves."""
+        self.assertTrue(exists([0, None, 3]))
+        self.assertFalse(exists([0, None, False]))
+        self.assertFalse(exists([]))
+
+    def test_with_pred(self):
+        """Tests checking the objects against a predicate, including falsy objects that satisfy it."""
+        self.assertTrue(exists([1, 2, 3], lambda x: x > 2))
+        self.assertFalse(exists([1, 2, 3], lambda x: x > 3))
+        self.assertTrue(exists([1, False], lambda x: x is False))
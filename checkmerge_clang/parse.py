@@ -160,12 +160,11 @@ class ClangParser(parse.Parser):
 
         # Resolve dependencies
         for node, deps in dependencies.items():
-            for ref, dt in deps:
-                rnode = mapping.get(ref, None)
+            resolved = ((mapping.get(ref, None), dt) for ref, dt in deps)
 
-                # Add dependency to node dependencies, ignore if we have no mapping
-                if rnode is not None and rnode != node:
-                    node.add_dependencies(ir.Dependency(rnode, dt))
+            # Add dependencies to node dependencies at once, ignore those we have no mapping for
+            node.add_dependencies(*(ir.Dependency(rnode, dt) for rnode, dt in resolved
+                                    if rnode is not None and rnode != node))
 
         # Return root of the tree
         return root
@@ -45,6 +45,16 @@ class AnalysisParser(object):
     """
     Parses the LLVM analysis information generated by CheckMerge-LLVM into Python objects.
     """
+    # Mapping from the dependency types in the analysis data to IR dependency types
+    _dependency_types: typing.Dict[str, ir.DependencyType] = {
+        "RAW": ir.DependencyType.FLOW,
+        "WAR": ir.DependencyType.ANTI,
+        "WAW": ir.DependencyType.OUTPUT,
+        "RAR": ir.DependencyType.INPUT,
+        "RAU": ir.DependencyType.FLOW,
+        "WAU": ir.DependencyType.ANTI,
+    }
+
     def __init__(self):
         # Initialize data structures
         self._dependency_refs: typing.Dict[str, AnalysisNode] = {}
@@ -94,12 +104,10 @@ class AnalysisParser(object):
             entity_name=data['name']
         ))
 
-        # Filter out blocks
-        blocks = {k: v for k, v in data.items() if isinstance(k, str) and k.startswith('block.')}
-
-        # Visit children
-        for block in blocks.items():
-            yield from self._visit_block(*block)
+        # Visit children, filtering out the blocks while iterating
+        for key, value in data.items():
+            if type(key) is str and key.startswith('block.'):
+                yield from self._visit_block(key, value)
 
         # Resolve dependencies
         self._resolve_dependencies()
@@ -113,48 +121,53 @@ class AnalysisParser(object):
 
         # Visit children
         for item in data:
-            assert isinstance(item, dict)
-            assert len(item) == 1
+            # Every item maps exactly one instruction name to its data, unpacking fails otherwise
+            (instruction_name, instruction_data), = item.items()
 
-            yield from self._visit_instruction(*list(item.items())[0])
+            yield from self._visit_instruction(instruction_name, instruction_data)
 
     def _visit_instruction(self, name, data) -> typing.Generator[AnalysisNode, None, None]:
-        # Check data structure
-        assert isinstance(name, str)
-        assert isinstance(data, dict)
-
-        # Preprocessing
+        # Preprocessing, the structure is not checked for every instruction as accessing malformed data fails anyway
         location = data.get('location')  # type: typing.Optional[str]
-
-        if 'variable' in data:
-            assert isinstance(data['variable'], dict)
-
         variable = data.get('variable')
+        dependencies = data.get('dependencies')
 
         if not location and variable:
             location = variable.get('location')
 
-        if location and location.startswith(':'):
-            location = self._function.reference.location.file + location
-
-        # Create instruction
-        self._instruction = AnalysisNode(SourceReference(
+        # Locations without a file are in the file of the function, build these directly instead of parsing them
+        if not location:
+            source_location = None
+        elif location.startswith(':'):
+            line, _, column = location[1:].partition(':')
+            source_location = ir.Location(self._function.reference.location.file, int(line), int(column))
+        else:
+            source_location = ir.Location.parse(location)
+
+        # Create instruction, kept in a local variable as it is used repeatedly below
+        instruction = self._instruction = AnalysisNode(SourceReference(
             entity_name=variable.get('name') if variable else None,
-            location=ir.Location.parse(location)
+            location=source_location
         ))
 
         # Set dependency ref
-        self._dependency_refs[name] = self._instruction
+        refs = self._dependency_refs
+        refs[name] = instruction
 
-        # Set dependencies
-        if 'dependencies' in data and data['dependencies'] is not None:
-            dependencies = data['dependencies']
+        # Set dependencies, which reference other instructions by their name prefixed with an asterisk
+        if dependencies is not None:
+            # Dependencies on instructions that were visited already are resolved immediately, others are deferred
+            for ref, typ in dependencies.items():
+                if type(ref) is str and ref.startswith('*'):
+                    ref = ref[1:]
+                    dependency = refs.get(ref)
 
-            assert isinstance(dependencies, dict)
+                    if dependency is not None:
+                        instruction.dependencies.add((dependency, self._dependency_type(typ)))
+                    else:
+                        self._dependencies[instruction].add((ref, typ))
 
-            self._dependencies[self._instruction].update(((d[1:], t) for d, t in dependencies.items() if isinstance(d, str) and d.startswith('*')))
-
-        yield self._instruction
+        yield instruction
 
     def _resolve_dependencies(self):
         data = self._dependencies
@@ -163,31 +176,28 @@ class AnalysisParser(object):
         for dependant, dependencies in data.items():
             for ref, typ in dependencies:
                 dependency = lookup.get(ref)
-                dependency_type = ir.DependencyType.OTHER
-
-                if typ == "RAW":
-                    dependency_type = ir.DependencyType.FLOW
-                elif typ == "WAR":
-                    dependency_type = ir.DependencyType.ANTI
-                elif typ == "WAW":
-                    dependency_type = ir.DependencyType.OUTPUT
-                elif typ == "RAR":
-                    dependency_type = ir.DependencyType.INPUT
-                elif typ == "RAU":
-                    dependency_type = ir.DependencyType.FLOW
-                elif typ == "WAU":
-                    dependency_type = ir.DependencyType.ANTI
 
                 if dependency:
                     assert isinstance(dependency, AnalysisNode)
-                    dependant.dependencies.add((dependency, dependency_type))
+                    dependant.dependencies.add((dependency, self._dependency_type(typ)))
+
+    @classmethod
+    def _dependency_type(cls, typ: str) -> ir.DependencyType:
+        """
+        Returns the IR dependency type for a dependency type in the analysis data.
+
+        :param typ: The dependency type in the analysis data.
+        :return: The corresponding IR dependency type, or the type for other dependencies if it is unknown.
+        """
+        return cls._dependency_types.get(typ, ir.DependencyType.OTHER)
 
     def _init_yaml(self):
         """
-        Initializes the YAML parser. Chooses to use the LibYAML C implementation when available.
+        Initializes the YAML parser. Chooses to use the LibYAML C implementation when available. The analysis data only
+        consists of plain mappings, lists and scalars, so the safe loader suffices.
         """
-        native = hasattr(yaml, 'CLoader')
-        self._Loader = yaml.CLoader if native else yaml.Loader
+        native = hasattr(yaml, 'CSafeLoader')
+        self._Loader = yaml.CSafeLoader if native else yaml.SafeLoader
 
     def _read(self, stream: Stream):
         """
@@ -1,5 +1,6 @@
 import unittest
 
+from checkmerge import ir
 from checkmerge_llvm.analysis import AnalysisParser
 
 
@@ -57,3 +58,56 @@ function.main:
     def test_parse(self):
         nodes = AnalysisParser.parse(self.text)
         self.assertEqual(4, len(nodes))
+
+    def test_parse_dependencies(self):
+        nodes = AnalysisParser.parse(self.text)
+        dependants = [node for node in nodes if node.dependencies]
+        self.assertEqual(1, len(dependants))
+
+        (dependency, typ), = dependants[0].dependencies
+        self.assertIn(dependency, nodes)
+        self.assertIsNone(dependency.reference.location)
+        self.assertEqual(ir.DependencyType.ANTI, typ)
+
+    def test_parse_forward_dependencies(self):
+        text = """
+function.main:
+  name: "main"
+  module: "test/mini.ll"
+  location: "/home/user/projects/checkmerge-llvm/test/mini.c:1:0"
+
+  block.entry:
+    - instruction.0:
+        opcode: load
+        location: ":2:5"
+        dependencies:
+          "*instruction.1": "RAW"
+    - instruction.1:
+        opcode: store
+        location: ":3:5"
+        """
+        nodes = AnalysisParser.parse(text)
+        dependants = [node for node in nodes if node.dependencies]
+        self.assertEqual(1, len(dependants))
+
+        (dependency, typ), = dependants[0].dependencies
+        self.assertEqual(3, dependency.reference.location.line)
+        self.assertEqual(5, dependency.reference.location.column)
+        self.assertEqual("/home/user/projects/checkmerge-llvm/test/mini.c", dependency.reference.location.file)
+        self.assertEqual(ir.DependencyType.FLOW, typ)
+
+    def test_parse_without_location(self):
+        text = """
+function.main:
+  name: "main"
+  module: "test/mini.ll"
+  location: "/home/user/projects/checkmerge-llvm/test/mini.c:1:0"
+
+  block.entry:
+    - instruction.0:
+        opcode: ret
+        """
+        nodes = AnalysisParser.parse(text)
+        locations = {node.reference.location for node in nodes}
+        self.assertIn(None, locations)
+        self.assertEqual(2, len(locations))